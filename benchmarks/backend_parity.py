@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import synthetic
+from common import pdf_to_jason
+
+
+def parse_with(path, parser, backend):
+    with pdf_to_jason.PageTexts(path, backend=backend) as doc:
+        start = time.perf_counter()
+        for index in range(len(doc)):
+            doc.text(index)
+        extract_time = time.perf_counter() - start
+        return list(parser(doc, "15/05/2024")), extract_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every process_* parser returns identical trades on each backend")
+    parser.add_argument("--trades", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--backend", default="pdfminer", choices=sorted(pdf_to_jason.BACKENDS))
+    args = parser.parse_args(argv)
+
+    # table parsers read pages through pdfplumber whatever the backend, so there is nothing to compare
+    table_parsers = {parser.__name__ for broker in pdf_to_jason.BROKERS for parser in broker.table_parsers}
+    failures = 0
+    print(f"{'layout':<15}{'trades':>8}{pdf_to_jason.DEFAULT_BACKEND + ' s':>14}{args.backend + ' s':>14}  result")
+    with tempfile.TemporaryDirectory() as directory:
+        for layout, (_, parser_name, _) in synthetic.LAYOUTS.items():
+            if parser_name in table_parsers:
+                continue
+            path = synthetic.generate(os.path.join(directory, f"{layout}.pdf"), layout, args.trades, args.pages)
+            parse = getattr(pdf_to_jason, parser_name)
+            expected, default_time = parse_with(path, parse, pdf_to_jason.DEFAULT_BACKEND)
+            actual, backend_time = parse_with(path, parse, args.backend)
+            identical = expected == actual and len(expected) == args.trades
+            failures += not identical
+            print(f"{layout:<15}{len(actual):>8}{default_time:>14.3f}{backend_time:>14.3f}  "
+                  f"{'identical' if identical else 'MISMATCH'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
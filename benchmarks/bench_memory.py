@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import synthetic
+from bench_parsers import peak_rss_mb
+from common import pdf_to_jason
+
+
+def run_case(path, parser_name, backend, low_memory):
+    parser = getattr(pdf_to_jason, parser_name)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    trades = 0
+    with pdf_to_jason.PageTexts(path, backend=backend, low_memory=low_memory) as doc:
+        for _ in parser(doc, "15/05/2024"):
+            trades += 1
+    return {
+        "trades": trades,
+        "seconds": time.perf_counter() - start,
+        "growth_mb": peak_rss_mb() - baseline,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak RSS growth while parsing long contract notes, with and without LOW_MEMORY")
+    parser.add_argument("--layout", default="dhan", choices=sorted(synthetic.LAYOUTS))
+    parser.add_argument("--pages", type=int, nargs="*", default=[25, 100])
+    parser.add_argument("--trades-per-page", type=int, default=40)
+    parser.add_argument("--backend", default=pdf_to_jason.DEFAULT_BACKEND, choices=sorted(pdf_to_jason.BACKENDS))
+    args = parser.parse_args(argv)
+
+    _, parser_name, _ = synthetic.LAYOUTS[args.layout]
+    print(f"{args.layout} notes, {args.trades_per_page} trades per page, {args.backend} backend\n")
+    print(f"{'pages':>6}{'trades':>8}{'default MB':>12}{'low-mem MB':>12}{'default s':>11}{'low-mem s':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for pages in args.pages:
+            path = synthetic.generate(os.path.join(directory, f"{args.layout}-{pages}.pdf"), args.layout,
+                                      pages * args.trades_per_page, pages)
+            results = []
+            for low_memory in (False, True):
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    results.append(pool.submit(run_case, path, parser_name, args.backend, low_memory).result())
+            default, low = results
+            print(f"{pages:>6}{low['trades']:>8}{default['growth_mb']:>12.1f}{low['growth_mb']:>12.1f}"
+                  f"{default['seconds']:>11.2f}{low['seconds']:>11.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
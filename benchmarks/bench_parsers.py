@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import synthetic
+from common import pdf_to_jason
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(path, parser_name, repeat):
+    parser = getattr(pdf_to_jason, parser_name)
+    extract_time = parse_time = float("inf")
+    for _ in range(repeat):
+        with pdf_to_jason.PageTexts(path) as doc:
+            start = time.perf_counter()
+            for index in range(len(doc)):
+                doc.text(index)
+            extract_time = min(extract_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            trades = list(parser(doc, "15/05/2024"))
+            parse_time = min(parse_time, time.perf_counter() - start)
+            pages = len(doc)
+    return {
+        "pages": pages,
+        "trades": len(trades),
+        "extract_s": extract_time,
+        "parse_s": parse_time,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of every process_* parser on synthetic contract notes")
+    parser.add_argument("--trades", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--layouts", nargs="*", default=list(synthetic.LAYOUTS))
+    args = parser.parse_args(argv)
+
+    print(f"{args.trades} trades over {args.pages} pages, best of {args.repeat}\n")
+    print(f"{'layout':<15}{'parser':<28}{'trades':>7}{'extract pg/s':>14}{'parse pg/s':>12}"
+          f"{'trades/s':>11}{'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for layout in args.layouts:
+            _, parser_name, _ = synthetic.LAYOUTS[layout]
+            path = synthetic.generate(os.path.join(directory, f"{layout}.pdf"), layout, args.trades, args.pages)
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(run_case, path, parser_name, args.repeat).result()
+            total = result["extract_s"] + result["parse_s"]
+            print(f"{layout:<15}{parser_name:<28}{result['trades']:>7}"
+                  f"{result['pages'] / result['extract_s']:>14.1f}{result['pages'] / result['parse_s']:>12.1f}"
+                  f"{result['trades'] / total:>11.1f}{result['peak_rss_mb']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
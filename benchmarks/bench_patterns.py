@@ -0,0 +1,75 @@
+import random
+import re
+import timeit
+
+from common import pdf_to_jason
+
+LINE_PATTERNS = ["goldmine", "jm_financial", "arihant", "axis", "bp_equities", "javeri", "greshma"]
+SECURITIES = ["RELIANCE INDUSTRIES LTD", "TATA CONSULTANCY SERV LT", "HDFC BANK LTD", "INFOSYS LIMITED"]
+BOILERPLATE = (
+    "This contract note is issued subject to the rules, bye-laws and regulations of the exchange "
+    "and is governed by the terms and conditions overleaf. Brokerage 0.03 GST 18.00 STT 0.10"
+)
+
+
+def synthetic_page(trades, noise_lines, rng):
+    lines = []
+    for n in range(trades):
+        qty = rng.randint(1, 500)
+        price = rng.uniform(10, 3000)
+        lines.append(
+            f"{rng.randrange(10**15, 10**16)} 09:{n % 60:02d}:{rng.randint(0, 59):02d} "
+            f"{rng.randrange(10**7, 10**8)} 09:{n % 60:02d}:{rng.randint(0, 59):02d} "
+            f"{rng.choice(SECURITIES)} {rng.choice('BS')} {qty} {price:.2f} 0.03 {price:.2f} "
+            f"{price:.2f} {qty * price:.2f}"
+        )
+    lines.extend(BOILERPLATE for _ in range(noise_lines))
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def per_function_scan(pages):
+    count = 0
+    for text in pages:
+        for name in LINE_PATTERNS:
+            pattern = re.compile(pdf_to_jason.PATTERNS[name].pattern)
+            count += sum(1 for _ in pattern.finditer(text))
+    return count
+
+
+def registry_scan(pages):
+    count = 0
+    for text in pages:
+        for name in LINE_PATTERNS:
+            count += sum(1 for _ in pdf_to_jason.PATTERNS[name].finditer(text))
+    return count
+
+
+def combined_scan(pages):
+    count = 0
+    for text in pages:
+        candidates = "\n".join(pdf_to_jason.TIMESTAMP_LINE.findall(text))
+        if not candidates:
+            continue
+        for name in LINE_PATTERNS:
+            count += sum(1 for _ in pdf_to_jason.PATTERNS[name].finditer(candidates))
+    return count
+
+
+def main(page_count=40, trades_per_page=30, noise_lines=60, repeat=5):
+    rng = random.Random(0)
+    pages = [synthetic_page(trades_per_page if n % 4 == 0 else 0, noise_lines, rng) for n in range(page_count)]
+    print(f"{page_count} pages, {trades_per_page} trades on every 4th page, {len(LINE_PATTERNS)} patterns\n")
+    print(f"{'engine':<20}{'matches':>10}{'best (ms)':>12}")
+    for name, engine in (
+        ("per-function", per_function_scan),
+        ("registry", registry_scan),
+        ("combined", combined_scan),
+    ):
+        matches = engine(pages)
+        best = min(timeit.repeat(lambda: engine(pages), number=1, repeat=repeat))
+        print(f"{name:<20}{matches:>10}{best * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
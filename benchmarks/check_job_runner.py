@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import synthetic
+from common import pdf_to_jason
+
+
+async def run_notes(paths, start_method, workers):
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        async with pdf_to_jason.JobRunner(workers=workers, executor=executor) as runner:
+            for path in paths:
+                await runner.submit(path)
+        return [result async for result in runner.results()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run JobRunner end to end on synthetic notes with `import pdf_to_jason`")
+    parser.add_argument("--trades", type=int, default=40)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--start-method", nargs="*", default=multiprocessing.get_all_start_methods())
+    args = parser.parse_args(argv)
+
+    # table parsers only run with TABLE_PARSING on, which JobRunner leaves to the module default
+    table_parsers = {parser.__name__ for broker in pdf_to_jason.BROKERS for parser in broker.table_parsers}
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [
+            synthetic.generate(os.path.join(directory, f"{layout}.pdf"), layout, args.trades, args.pages)
+            for layout, (_, parser_name, _) in synthetic.LAYOUTS.items() if parser_name not in table_parsers
+        ]
+        for start_method in args.start_method:
+            results = asyncio.run(run_notes(paths, start_method, args.workers))
+            bad = [(name, error or f"{len(trades)} trades") for _, name, trades, error in results
+                   if error is not None or len(trades) != args.trades]
+            if len(results) != len(paths):
+                bad.append(("<runner>", f"{len(results)} results for {len(paths)} notes"))
+            failures += bool(bad)
+            print(f"{start_method:<12}{len(results):>4} notes  {'ok' if not bad else 'FAILED'}")
+            for name, problem in bad:
+                print(f"    {name}: {problem}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
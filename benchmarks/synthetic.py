@@ -0,0 +1,232 @@
+import random
+
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+FONT_SIZE = 6
+LINE_HEIGHT = 8
+MARGIN = 24
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+SECURITIES = ["RELIANCE INDUSTRIES LTD", "TATA STEEL LIMITED", "HDFC BANK LTD", "INFOSYS LIMITED", "ITC LTD"]
+BOILERPLATE = [
+    "This contract note is issued subject to the rules, bye-laws and regulations of the exchange.",
+    "Brokerage is charged as per the tariff agreed with the client. GST and stamp duty are levied as applicable.",
+    "Kindly report discrepancies, if any, within 24 hours of receipt of this contract note.",
+]
+
+
+def _time(rng):
+    return f"{rng.randint(9, 15):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+
+
+def _trade(rng):
+    qty = rng.randint(1, 500)
+    price = round(rng.uniform(10, 3000), 2)
+    return qty, price, round(qty * price, 2)
+
+
+def _debit(side, text):
+    return f"({text})" if side in ("B", "BUY") else text
+
+
+def _goldmine(rng):
+    qty, price, total = _trade(rng)
+    side = rng.choice("BS")
+    return [f"{rng.randrange(10**15, 10**16)} {_time(rng)} {rng.randrange(10**7, 10**8)} {_time(rng)} "
+            f"{rng.choice(SECURITIES)} {side} {qty} {price:.2f} 0.05 {price:.2f} {total if side == 'S' else -total:.2f}"]
+
+
+def _dhan(rng):
+    qty, price, total = _trade(rng)
+    return [f"{rng.randrange(10**15, 10**16)} {_time(rng)} {rng.randrange(10**7, 10**8)} {_time(rng)} "
+            f"SELAN EXPLO. TECH LT {rng.choice(['BUY', 'SELL'])} {qty} {price:.2f} 0.05 {price:.2f} "
+            f"{price:.2f} 0.10 {total:.2f} NSE-M"]
+
+
+def _jm_financial(rng):
+    qty, price, total = _trade(rng)
+    return [f"{rng.randrange(10**9, 10**10)} {_time(rng)} {rng.randrange(10**7, 10**8)} {_time(rng)} "
+            f"{rng.choice(SECURITIES)} {rng.choice(['BUY', 'SELL'])} {qty} {price:,.2f} {price:,.2f} {total:,.2f}"]
+
+
+def _arihant(rng):
+    qty, price, total = _trade(rng)
+    side = rng.choice("BS")
+    return [f"{_time(rng)} {rng.randrange(10**7, 10**8)} {rng.choice(SECURITIES)} {side} "
+            f"{qty} {price:.2f} 0.05 {price:.2f} {total if side == 'S' else -total:.2f}"]
+
+
+def _axis(rng):
+    qty, price, total = _trade(rng)
+    side = rng.choice(["BUY", "SELL"])
+    return [f"{_time(rng)} {rng.randrange(10**7, 10**8)} {rng.choice(SECURITIES)} {side} "
+            f"{qty} {price:.2f} 0.05 {price:.2f} {_debit(side, f'{total:,.2f}')}"]
+
+
+def _bp_equities(rng):
+    qty, price, total = _trade(rng)
+    return [f"{_time(rng)} {rng.randrange(10**7, 10**8)} {_time(rng)} {rng.choice(SECURITIES)} "
+            f"{rng.choice(['Buy', 'Sell'])} {qty} {price:.2f} 0.05 {price:.2f} {price:.2f}"]
+
+
+def _javeri(rng):
+    qty, price, total = _trade(rng)
+    return [f"{rng.randrange(10**9, 10**10)} {_time(rng)} {rng.randrange(10**7, 10**8)} {_time(rng)} "
+            f"{rng.choice(SECURITIES)} {rng.choice(['Buy', 'Sell'])} {qty} {price:.2f}"]
+
+
+def _greshma(rng):
+    qty, price, total = _trade(rng)
+    side = rng.choice("BS")
+    return [f"{_time(rng)} {rng.randrange(10**7, 10**8)} {rng.choice(SECURITIES)} {side} "
+            f"{qty} {price:.2f} 0.05 {price:.2f} {_debit(side, f'{total:,.2f}')}"]
+
+
+def _kotak(rng):
+    qty, price, total = _trade(rng)
+    return [f"{rng.choice(['GMDCLTD EQ', 'SUN RETAIL LIMITED'])} {qty} {price:.2f} {total:,.2f}"]
+
+
+def _rudra(rng):
+    qty, price, total = _trade(rng)
+    return [rng.choice(SECURITIES), f"NSE {price:.2f} {total:.2f}D {qty} {total:.2f}"]
+
+
+def _arihant_mer(rng):
+    qty, price, total = _trade(rng)
+    return [f"{price:.2f} 0.0000 {price:.2f} 0.05 {price:.2f} {qty}{rng.choice('BS')} OPTSTK "
+            f"{rng.choice(SECURITIES)} {_time(rng)} {rng.randrange(10**7, 10**8)} {_time(rng)} "
+            f"{rng.randrange(10**9, 10**10)}"]
+
+
+def _zerodha(rng):
+    qty, price, total = _trade(rng)
+    side = rng.choice("BS")
+    return [f"{rng.randrange(10**9, 10**10)} {_time(rng)} {rng.randrange(10**7, 10**8)} {_time(rng)} "
+            f"{rng.choice(SECURITIES)} / INE{rng.randrange(100, 999)}A01016 {side} {qty} "
+            f"{price:.2f} {_debit(side, f'{total:.2f}')}"]
+
+
+TABLE_COLUMNS = {
+    "dhan_table": [
+        ("ORDER NO", 24), ("ORDER TIME", 110), ("TRADE NO", 160), ("TRADE TIME", 210), ("SECURITY", 265),
+        ("B/S", 395), ("QTY", 420), ("RATE", 450), ("BROKERAGE", 490), ("NET RATE", 545), ("CLOSING RATE", 595),
+        ("STT", 660), ("NET TOTAL", 690), ("EXCHANGE", 760),
+    ],
+    "kotak_table": [("SECURITY", 24), ("QUANTITY", 200), ("RATE", 280), ("AMOUNT", 360)],
+    "rudra_table": [("SECURITY", 24), ("EXCHANGE", 200), ("RATE", 260), ("AMOUNT", 320), ("QTY", 400), ("TOTAL", 440)],
+}
+
+
+def _cells(layout, texts):
+    return [[(x, text) for (_, x), text in zip(TABLE_COLUMNS[layout], texts)]]
+
+
+def _dhan_table(rng):
+    qty, price, total = _trade(rng)
+    return _cells("dhan_table", [
+        str(rng.randrange(10**15, 10**16)), _time(rng), str(rng.randrange(10**7, 10**8)), _time(rng),
+        rng.choice(SECURITIES), rng.choice(["BUY", "SELL"]), str(qty), f"{price:.2f}", "0.05", f"{price:.2f}",
+        f"{price:.2f}", "0.10", f"{total:.2f}", "NSE-M",
+    ])
+
+
+def _kotak_table(rng):
+    qty, price, total = _trade(rng)
+    return _cells("kotak_table", [rng.choice(SECURITIES), str(qty), f"{price:.2f}", f"{total:,.2f}"])
+
+
+def _rudra_table(rng):
+    qty, price, total = _trade(rng)
+    return _cells("rudra_table", [rng.choice(SECURITIES), "NSE", f"{price:.2f}", f"{total:.2f}D", str(qty), f"{total:.2f}"])
+
+
+LAYOUTS = {
+    "dhan": ("DHAN - MONEYLICIOUS SECURITIES PVT LTD", "process_dhan", _dhan),
+    "goldmine": ("GOLDMINE STOCKS PVT LTD", "process_goldmine_generic", _goldmine),
+    "jm_financial": ("JM FINANCIAL SERVICES LTD", "process_jm_financial", _jm_financial),
+    "arihant": ("ARIHANT CAPITAL MARKETS LTD", "process_arihant", _arihant),
+    "arihant_mer": ("ARIHANT CAPITAL MARKETS LTD", "process_arihant_mer", _arihant_mer),
+    "axis": ("AXIS SECURITIES LTD", "process_axis", _axis),
+    "bp_equities": ("BP EQUITIES PVT LTD", "process_bp_equities", _bp_equities),
+    "javeri": ("JAVERI FISCAL SERVICES LTD", "process_javeri", _javeri),
+    "javeri_signed": ("JAVERI FISCAL SERVICES LTD", "process_javeri_signed", _javeri),
+    "greshma": ("GRESHMA SHARES AND STOCKS LTD", "process_greshma", _greshma),
+    "kotak": ("KOTAK SECURITIES LTD", "process_kotak", _kotak),
+    "rudra": ("RUDRA SHARES AND STOCK BROKERS LTD", "process_rudra", _rudra),
+    "zerodha": ("ZERODHA BROKING LTD", "process_zerodha_2018_style", _zerodha),
+    "zerodha_old": ("ZERODHA BROKING LTD", "process_zerodha_old", _zerodha),
+    "dhan_table": ("DHAN - MONEYLICIOUS SECURITIES PVT LTD", "process_dhan_table", _dhan_table),
+    "kotak_table": ("KOTAK SECURITIES LTD", "process_kotak_table", _kotak_table),
+    "rudra_table": ("RUDRA SHARES AND STOCK BROKERS LTD", "process_rudra_table", _rudra_table),
+}
+
+
+def contract_note_pages(layout, trades, pages, seed=0):
+    broker, _, row = LAYOUTS[layout]
+    rng = random.Random(seed)
+    columns = [[(x, caption) for caption, x in TABLE_COLUMNS[layout]]] if layout in TABLE_COLUMNS else []
+    header = [broker, "CONTRACT NOTE CUM TAX INVOICE", "Trade Date : 15/05/2024", *columns]
+    rows = [row(rng) for _ in range(trades)]
+    per_page = -(-trades // pages) if trades else 0
+    if sum(len(trade) for trade in rows[:per_page]) + len(header) + 1 > LINES_PER_PAGE:
+        raise ValueError(f"{trades} trades do not fit on {pages} pages; add pages")
+    result = []
+    for page in range(pages):
+        lines = list(header) if page == 0 else [broker, *columns]
+        for trade in rows[page * per_page:(page + 1) * per_page]:
+            lines.extend(trade)
+        if page == pages - 1:
+            lines.append("Pay in/Pay out obligation")
+        while len(lines) < LINES_PER_PAGE:
+            lines.append(BOILERPLATE[len(lines) % len(BOILERPLATE)])
+        result.append(lines)
+    return result
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, pages):
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        ops = [f"BT /F1 {FONT_SIZE} Tf"]
+        for number, line in enumerate(lines):
+            y = PAGE_HEIGHT - MARGIN - number * LINE_HEIGHT
+            cells = [(MARGIN, line)] if isinstance(line, str) else line
+            ops.extend(f"1 0 0 1 {x} {y} Tm ({_escape(text)}) Tj" for x, text in cells)
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_ref)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate(path, layout, trades=100, pages=5, seed=0):
+    write_pdf(path, contract_note_pages(layout, trades, pages, seed))
+    return path
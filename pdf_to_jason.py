@@ -0,0 +1,2365 @@
+import argparse
+import glob
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from functools import partial
+
+pdf_infos = {
+    "dhan_2.pdf": "15/05/2024",
+    "GOLDMINE_1.pdf": "10/05/2024",
+    "GOLDMINE_2.pdf": "14/05/2024",
+    "JM FINANCIAL.PDF": "03/04/2024",
+    "ARIHANT CAPITAL MARKETS LTD.pdf": "19/10/2023",
+    "AXIS.pdf": "18/01/2024",
+    "BP Equities Pvt. Ltd..pdf": "23/05/2024",
+    "JAVERI FISCAL SERVICES LTD..pdf": "12/11/2023",
+    "Kotak_06-04-2021_Bill.pdf": "06/04/2021",
+    "greshma.pdf": "14/12/2023",
+    "rudra (1).pdf": "09/05/2024",
+    "CN_20231019_482600121_MER.pdf (1).pdf": "19/10/2023",
+    "CNB_11_COMMON_CONTRACT_12Nov2023_S137__3951_signed (1).pdf": "12/11/2023",
+    "Zerodha 11102018.pdf": "11/10/2018",
+    "zerodha_old.pdf": "15/10/2018"
+    
+}
+
+PDF_DIR = "C:/Users/DELL8/OneDrive/Desktop/equity_trading"
+
+BATCH_WORKERS = os.cpu_count() or 1
+PAGES_PER_JOB = 25
+
+OUTPUT_FORMAT = "ndjson"
+OUTPUT_PATH = "trades_output.ndjson"
+SINK_BATCH_SIZE = 50000
+INDEX_PATH = "trades_index.sqlite"
+PRINT_TRADES = True
+
+MANIFEST_PATH = "ingest_manifest.json"
+SHARD_DIR = "shards"
+WATCH_INTERVAL = 60
+
+PROFILE = False
+VALIDATE = True
+NET_TOTAL_TOLERANCE = 0.025
+REPORT_PATH = "run_report.json"
+
+USE_EXTRACTION_CACHE = True
+EXTRACTION_CACHE_DIR = ".extraction_cache"
+EXTRACTION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+DEFAULT_BACKEND = "pdfplumber"
+
+COMBINED_SCAN = False
+LOW_MEMORY = False
+TABLE_PARSING = False
+TIMESTAMP_LINE = re.compile(r"^.*\d{2}:\d{2}:\d{2}.*$", re.MULTILINE)
+
+Layout = namedtuple(
+    "Layout", "first_page last_page bbox stop_marker backend", defaults=(0, None, None, None, None)
+)
+DEFAULT_LAYOUT = Layout()
+# header: column captions left to right; fields: the Trade field each column holds, None to ignore it
+TableLayout = namedtuple("TableLayout", "header fields")
+
+
+def file_digest(path, salt=b""):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    digest.update(salt)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    # running size per directory, shared by the pickled copies each worker job receives
+    _totals = {}
+
+    def __init__(self, directory=EXTRACTION_CACHE_DIR, max_bytes=EXTRACTION_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, source):
+        import pdfminer
+        import pdfplumber
+        versions = f"{pdfplumber.__version__}|{pdfminer.__version__}".encode()
+        if isinstance(source, bytes):
+            return hashlib.sha256(source + versions).hexdigest()
+        return file_digest(source, versions)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key, page_count, texts):
+        import tempfile
+        os.makedirs(self.directory, exist_ok=True)
+        # page-range jobs of one PDF race here without a lock: the last writer wins and the loser's pages are
+        # extracted again on the next run
+        entry = self.load(key) or {"page_count": page_count, "pages": {}}
+        entry["pages"].update(texts)
+        # shard nodes share the cache directory, so temp names must be unique across hosts, not just pids
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f"{key}.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        size = os.path.getsize(tmp_path)
+        path = self._path(key)
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+        total = self._total() + size - replaced
+        os.replace(tmp_path, path)
+        self._totals[self.directory] = total
+        if total > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _total(self):
+        # only counts this process's writes between scans, so concurrent writers can overshoot max_bytes until
+        # the next evict()
+        if self.directory not in self._totals:
+            self._totals[self.directory] = sum(size for _, size, _ in self._entries())
+        return self._totals[self.directory]
+
+    def evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._totals[self.directory] = total
+
+    def invalidate(self, pdf_path):
+        try:
+            os.remove(self._path(self.key(pdf_path)))
+        except OSError:
+            pass
+        self._totals.pop(self.directory, None)
+
+    def clear(self):
+        self._totals.pop(self.directory, None)
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
+
+
+class Metrics:
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.pages = {}
+
+    @contextmanager
+    def stage(self, name, page=None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, page)
+
+    def add(self, name, seconds, page=None):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if page is not None:
+            page_stats = self.pages.setdefault(page, {})
+            page_stats[name] = page_stats.get(name, 0.0) + seconds
+
+    def count(self, name, n=1, page=None):
+        self.counters[name] = self.counters.get(name, 0) + n
+        if page is not None:
+            page_stats = self.pages.setdefault(page, {})
+            page_stats[name] = page_stats.get(name, 0) + n
+
+    def merge(self, other):
+        for name, seconds in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for name, n in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + n
+        for page, stats in other.pages.items():
+            page_stats = self.pages.setdefault(page, {})
+            for name, value in stats.items():
+                page_stats[name] = page_stats.get(name, 0) + value
+
+    def to_dict(self):
+        return {"stages": self.stages, "counters": self.counters, "pages": self.pages}
+
+
+class NullMetrics:
+    enabled = False
+    _stage = nullcontext()
+
+    def stage(self, name, page=None):
+        return self._stage
+
+    def add(self, name, seconds, page=None):
+        pass
+
+    def count(self, name, n=1, page=None):
+        pass
+
+    def merge(self, other):
+        pass
+
+    def to_dict(self):
+        return None
+
+
+NULL_METRICS = NullMetrics()
+
+
+class PdfplumberBackend:
+    def open(self, source):
+        import pdfplumber
+        return pdfplumber.open(source)
+
+    def page_count(self, pdf):
+        return len(pdf.pages)
+
+    def extract(self, pdf, index, bbox):
+        page = pdf.pages[index]
+        if bbox is not None:
+            x0, top, x1, bottom = bbox
+            page = page.crop((x0 * page.width, top * page.height, x1 * page.width, bottom * page.height))
+        return page.extract_text() or ""
+
+    def release(self, pdf, index):
+        pdf.pages[index].close()
+
+    def close(self, pdf):
+        pdf.close()
+
+
+class _PdfminerDocument:
+    def __init__(self, source, laparams):
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+        self.file = open(source, "rb") if isinstance(source, str) else source
+        self.pages = list(PDFPage.create_pages(PDFDocument(PDFParser(self.file))))
+        rsrcmgr = PDFResourceManager(caching=True)
+        self.device = PDFPageAggregator(rsrcmgr, laparams=laparams)
+        self.interpreter = PDFPageInterpreter(rsrcmgr, self.device)
+
+    def layout(self, index):
+        self.interpreter.process_page(self.pages[index])
+        return self.device.get_result()
+
+
+def _iter_chars(item):
+    from pdfminer.layout import LTChar, LTContainer
+    for child in item:
+        if isinstance(child, LTChar):
+            yield child
+        elif isinstance(child, LTContainer):
+            yield from _iter_chars(child)
+
+
+def _chars_to_text(chars, x_tolerance=3, y_tolerance=3):
+    lines, line, last_top = [], [], None
+    for char in sorted(chars):
+        if last_top is not None and char[0] - last_top > y_tolerance:
+            lines.append(line)
+            line = []
+        line.append(char)
+        last_top = char[0]
+    if line:
+        lines.append(line)
+    text_lines = []
+    for line in lines:
+        words, word, last_x1 = [], "", None
+        for _, x0, x1, text in sorted(line, key=lambda char: char[1]):
+            if text.isspace() or (word and x0 - last_x1 > x_tolerance):
+                if word:
+                    words.append(word)
+                word = ""
+                if text.isspace():
+                    continue
+            word += text
+            last_x1 = x1
+        if word:
+            words.append(word)
+        text_lines.append(" ".join(words))
+    return "\n".join(text_lines)
+
+
+class PdfminerBackend:
+    def __init__(self, laparams=None):
+        self.laparams = laparams
+
+    def open(self, source):
+        return _PdfminerDocument(source, self.laparams)
+
+    def page_count(self, pdf):
+        return len(pdf.pages)
+
+    def extract(self, pdf, index, bbox):
+        ltpage = pdf.layout(index)
+        page_top, width, height = ltpage.y1, ltpage.width, ltpage.height
+        x0, top, x1, bottom = bbox if bbox is not None else (0, 0, 1, 1)
+
+        def inside(item):
+            item_top = page_top - item.y1
+            center_x, center_y = (item.x0 + item.x1) / 2, item_top + item.height / 2
+            return x0 * width <= center_x <= x1 * width and top * height <= center_y <= bottom * height
+
+        if self.laparams is not None:
+            from pdfminer.layout import LTTextContainer, LTTextLine
+            if bbox is None:
+                return "".join(item.get_text() for item in ltpage if isinstance(item, LTTextContainer))
+            # pdfminer's text boxes can straddle the crop edge, so crop line by line
+            return "".join(
+                line.get_text() for item in ltpage if isinstance(item, LTTextContainer)
+                for line in item if isinstance(line, LTTextLine) and inside(line)
+            )
+        chars = [(page_top - char.y1, char.x0, char.x1, char.get_text()) for char in _iter_chars(ltpage) if inside(char)]
+        return _chars_to_text(chars)
+
+    def release(self, pdf, index):
+        pdf.device.result = None
+
+    def close(self, pdf):
+        pdf.file.close()
+
+
+BACKENDS = {
+    "pdfplumber": PdfplumberBackend(),
+    "pdfminer": PdfminerBackend(),
+}
+
+
+def _page_key(index, bbox, backend):
+    key = str(index)
+    if bbox is not None:
+        key += ":" + ",".join(f"{value:g}" for value in bbox)
+    return f"{key}|{backend}"
+
+
+def _text_variant(text, joined, prefilter):
+    if joined:
+        if prefilter and not TIMESTAMP_LINE.search(text):
+            return ""
+        return text.replace("\n", " ")
+    if prefilter:
+        return "\n".join(TIMESTAMP_LINE.findall(text))
+    return text
+
+
+def _header_columns(page, header, y_tolerance=3):
+    lines, last_top = [], None
+    for word in sorted(page.extract_words(), key=lambda word: word["top"]):
+        if last_top is None or word["top"] - last_top > y_tolerance:
+            lines.append([])
+        lines[-1].append(word)
+        last_top = word["top"]
+    for line in lines:
+        line.sort(key=lambda word: word["x0"])
+        texts = [word["text"].upper() for word in line]
+        spans, start = [], 0
+        for caption in header:
+            tokens = caption.split()
+            for i in range(start, len(texts) - len(tokens) + 1):
+                if texts[i:i + len(tokens)] == tokens:
+                    spans.append((line[i]["x0"], line[i + len(tokens) - 1]["x1"]))
+                    start = i + len(tokens)
+                    break
+            else:
+                break
+        if len(spans) == len(header):
+            return [(left[1] + right[0]) / 2 for left, right in zip(spans, spans[1:])]
+    return None
+
+
+class PageTexts:
+    def __init__(self, source, cache=None, metrics=NULL_METRICS, backend=DEFAULT_BACKEND, name=None,
+                 low_memory=LOW_MEMORY):
+        if isinstance(source, (str, os.PathLike)):
+            self.pdf_path, self._data = os.fspath(source), None
+        else:
+            self.pdf_path = None
+            self._data = source if isinstance(source, bytes) else source.read()
+            name = name or os.path.basename(getattr(source, "name", "") or "<stream>")
+        self.name = name or os.path.basename(self.pdf_path)
+        self.metrics = metrics
+        # pages_scanned and match time go here, so _run_parser can keep only the chosen candidate's
+        self.scan_metrics = metrics
+        self.backend = backend
+        self.low_memory = low_memory
+        self.current_page = None
+        self.stopped_at = None
+        self.scanned_pages = set()
+        self._handles = {}
+        self._text = {}
+        self._variants = {}
+        self._columns = {}
+        self._page_count = None
+        self._cache = cache
+        self._cache_key = None
+        self._uncached = {}
+        if cache is not None:
+            self._cache_key = cache.key(self.pdf_path or self._data)
+            entry = cache.load(self._cache_key)
+            if entry is not None:
+                self._page_count = entry["page_count"]
+                self._text = dict(entry["pages"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def handle(self, backend=None):
+        backend = backend or self.backend
+        if backend not in self._handles:
+            with self.metrics.stage("open"):
+                source = self.pdf_path or io.BytesIO(self._data)
+                self._handles[backend] = BACKENDS[backend].open(source)
+        return self._handles[backend]
+
+    @property
+    def pdf(self):
+        return self.handle("pdfplumber")
+
+    def __len__(self):
+        if self._page_count is None:
+            self._page_count = BACKENDS[self.backend].page_count(self.handle())
+        return self._page_count
+
+    def page_range(self, pages=None, layout=DEFAULT_LAYOUT):
+        page_count = len(self)
+        start, stop = 0, page_count
+        if pages is not None:
+            start, stop = pages.start, min(pages.stop, page_count)
+        if layout.last_page is not None:
+            last_page = layout.last_page if layout.last_page >= 0 else page_count + layout.last_page
+            stop = min(stop, last_page + 1)
+        return range(max(start, layout.first_page), stop)
+
+    def text(self, index, bbox=None, backend=None):
+        backend = backend or self.backend
+        key = _page_key(index, bbox, backend)
+        if key in self._text:
+            return self._text[key]
+        handle = self.handle(backend)
+        with self.metrics.stage("extract", index):
+            text = BACKENDS[backend].extract(handle, index, bbox)
+        if self.low_memory:
+            BACKENDS[backend].release(handle, index)
+        # plain text is a few KB a page; keeping it spares re-extracting page 0 and each candidate parser's pages
+        self._text[key] = text
+        if self._cache is not None:
+            self._uncached[key] = text
+        return text
+
+    def _texts(self, pages, layout, joined, prefilter):
+        prefilter = prefilter and COMBINED_SCAN
+        for index in self.page_range(pages, layout):
+            text = self.text(index, layout.bbox, layout.backend)
+            stop = layout.stop_marker.search(text) if layout.stop_marker else None
+            if stop is not None:
+                self.current_page = index
+                self.stopped_at = index
+                self.scanned_pages.add(index)
+                self.scan_metrics.count("pages_scanned", page=index)
+                with self.scan_metrics.stage("match", index):
+                    yield _text_variant(text[:stop.start()], joined, prefilter)
+                return
+            if self.low_memory:
+                variant = _text_variant(text, joined, prefilter)
+            else:
+                key = (_page_key(index, layout.bbox, layout.backend or self.backend), joined, prefilter)
+                if key not in self._variants:
+                    self._variants[key] = _text_variant(text, joined, prefilter)
+                variant = self._variants[key]
+            self.current_page = index
+            self.scanned_pages.add(index)
+            if not self.scan_metrics.enabled:
+                yield variant
+                continue
+            self.scan_metrics.count("pages_scanned", page=index)
+            with self.scan_metrics.stage("match", index):
+                yield variant
+
+    def texts(self, pages=None, prefilter=False, layout=DEFAULT_LAYOUT):
+        return self._texts(pages, layout, False, prefilter)
+
+    def joined_texts(self, pages=None, prefilter=False, layout=DEFAULT_LAYOUT):
+        return self._texts(pages, layout, True, prefilter)
+
+    def table_rows(self, table, pages=None, layout=DEFAULT_LAYOUT):
+        pdf = self.pdf
+        for index in self.page_range(pages, layout):
+            page = pdf.pages[index]
+            if layout.bbox is not None:
+                x0, top, x1, bottom = layout.bbox
+                page = page.crop((x0 * page.width, top * page.height, x1 * page.width, bottom * page.height))
+            with self.metrics.stage("extract", index):
+                boundaries = self._columns.get(table)
+                if boundaries is None:
+                    boundaries = self._columns[table] = _header_columns(page, table.header)
+                rows, chars = [], page.chars
+                if boundaries is not None and chars:
+                    # "text" row edges only span the page's words, so the outer column lines must too
+                    left, right = min(char["x0"] for char in chars), max(char["x1"] for char in chars)
+                    rows = page.extract_table({
+                        "vertical_strategy": "explicit",
+                        "explicit_vertical_lines": [left, *boundaries, right],
+                        "horizontal_strategy": "text",
+                    }) or []
+            if self.low_memory:
+                pdf.pages[index].close()
+            self.current_page = index
+            self.scanned_pages.add(index)
+            self.scan_metrics.count("pages_scanned", page=index)
+            for row in rows:
+                cells = [(cell or "").strip() for cell in row]
+                if layout.stop_marker and layout.stop_marker.search(" ".join(cells)):
+                    self.stopped_at = index
+                    return
+                if len(cells) == len(table.fields):
+                    yield {field: cell for field, cell in zip(table.fields, cells) if field}
+
+    def close(self):
+        if self._cache is not None and self._uncached:
+            self._cache.store(self._cache_key, len(self), self._uncached)
+            self._uncached = {}
+        for backend, handle in self._handles.items():
+            BACKENDS[backend].close(handle)
+        self._handles = {}
+
+
+@contextmanager
+def open_document(source):
+    if isinstance(source, PageTexts):
+        yield source
+        return
+    with PageTexts(source) as doc:
+        yield doc
+
+PAISE = Decimal("0.01")
+
+
+@dataclass(slots=True)
+class Trade:
+    source_pdf: str
+    trade_time: str
+    trade_no: str
+    trade_date: str
+    security: str
+    side: str
+    quantity: int
+    price: Decimal
+    net_total: Decimal
+    order_no: str = ""
+
+    def __post_init__(self):
+        self.source_pdf = sys.intern(self.source_pdf)
+        self.trade_date = sys.intern(self.trade_date)
+        self.security = sys.intern(self.security)
+
+    def to_dict(self):
+        return {
+            "Source PDF": self.source_pdf,
+            "Trade Time": self.trade_time,
+            "Trade No": self.trade_no,
+            "Trade Date": self.trade_date,
+            "Security/Contract Description": self.security,
+            "Buy(B)/Sell(S)": self.side,
+            "Quantity": str(self.quantity),
+            "Trade Price Per Unit": str(self.price),
+            "Net Total": str(self.net_total)
+        }
+
+
+def validate_time_format(time_str):
+    if not isinstance(time_str, str):
+        return False
+    parts = time_str.strip().split(":")
+    return len(parts) == 3 and all(part.isdigit() for part in parts)
+
+
+# Parsers whose net total keeps the note's sign: negative (or bracketed) for buys, positive for sells
+SIGNED_NET_TOTALS = {
+    "process_goldmine_generic", "process_arihant", "process_axis", "process_greshma",
+    "process_zerodha_old", "process_zerodha_2018_style",
+}
+
+
+def _valid_times(times, np):
+    codes = np.array(times, dtype="U9").view(np.uint32).reshape(-1, 9)
+    digits = codes[:, [0, 1, 3, 4, 6, 7]] - ord("0")
+    valid = (digits < 10).all(axis=1) & (codes[:, 2] == ord(":")) & (codes[:, 5] == ord(":")) & (codes[:, 8] == 0)
+    hours, minutes, seconds = (digits[:, i] * 10 + digits[:, i + 1] for i in (0, 2, 4))
+    return valid & (hours < 24) & (minutes < 60) & (seconds < 60)
+
+
+def validate_trades(records, parser_name=None, tolerance=NET_TOTAL_TOLERANCE):
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("numpy is required for trade validation: pip install numpy") from None
+    if not records:
+        return []
+    quantity = np.fromiter((trade.quantity for trade in records), dtype=np.int64, count=len(records))
+    price = np.fromiter((trade.price for trade in records), dtype=np.float64, count=len(records))
+    net_total = np.fromiter((trade.net_total for trade in records), dtype=np.float64, count=len(records))
+    side = np.array([trade.side for trade in records])
+    times = [trade.trade_time for trade in records]
+
+    gross = quantity * price
+    checks = {
+        "trade_time": (np.array(times) != "") & ~_valid_times(times, np),
+        "quantity": quantity <= 0,
+        "price": price <= 0,
+        "net_total": np.abs(np.abs(net_total) - gross) > np.maximum(gross * tolerance, 0.01),
+    }
+    if parser_name in SIGNED_NET_TOTALS:
+        checks["sign"] = ((side == "B") & (net_total > 0)) | ((side == "S") & (net_total < 0))
+
+    anomalies = []
+    for check, failed in checks.items():
+        for row in np.flatnonzero(failed):
+            trade = records[row]
+            anomalies.append({
+                "check": check,
+                "trade_no": trade.trade_no,
+                "trade_time": trade.trade_time,
+                "security": trade.security,
+                "side": trade.side,
+                "quantity": trade.quantity,
+                "price": str(trade.price),
+                "net_total": str(trade.net_total),
+            })
+    return anomalies
+
+MONTHS = {name: number for number, name in enumerate(
+    ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"), start=1
+)}
+
+HEADER_DATE = re.compile(
+    r"TRAD(?:E|ING)\s*DATE\s*[:\-]?\s*"
+    r"(?P<day>\d{1,2})[/.\- ](?P<month>\d{1,2}|[A-Za-z]{3,9})[/.\- ](?P<year>\d{4}|\d{2})(?!\d)",
+    re.IGNORECASE
+)
+
+FILENAME_DATES = [
+    re.compile(r"(?<!\d)(?P<day>\d{2})[-_.](?P<month>\d{2})[-_.](?P<year>\d{4})(?!\d)"),
+    re.compile(r"(?<![A-Za-z\d])(?P<day>\d{1,2})(?P<month>[A-Za-z]{3})(?P<year>\d{4})(?!\d)"),
+    re.compile(r"(?<!\d)(?P<year>\d{4})(?P<month>\d{2})(?P<day>\d{2})(?!\d)"),
+    re.compile(r"(?<!\d)(?P<day>\d{2})(?P<month>\d{2})(?P<year>\d{4})(?!\d)"),
+]
+
+
+def _format_date(day, month, year):
+    if not month.isdigit():
+        month = MONTHS.get(month[:3].upper())
+        if month is None:
+            return None
+    year = int(year)
+    if year < 100:
+        year += 2000
+    try:
+        return datetime(year, int(month), int(day)).strftime("%d/%m/%Y")
+    except ValueError:
+        return None
+
+
+def trade_date_from_filename(file_name):
+    for pattern in FILENAME_DATES:
+        for match in pattern.finditer(file_name):
+            trade_date = _format_date(match.group("day"), match.group("month"), match.group("year"))
+            if trade_date:
+                return trade_date
+    return None
+
+
+def trade_date_from_header(text):
+    for match in HEADER_DATE.finditer(text):
+        trade_date = _format_date(match.group("day"), match.group("month"), match.group("year"))
+        if trade_date:
+            return trade_date
+    return None
+
+
+def detect_trade_date(doc):
+    if len(doc):
+        trade_date = trade_date_from_header(doc.text(0))
+        if trade_date:
+            return trade_date
+    return trade_date_from_filename(doc.name) or ""
+
+
+PATTERNS = {
+    "goldmine": re.compile(
+        r"(\d{13,})\s+"          
+        r"(\d{2}:\d{2}:\d{2})\s+" 
+        r"(\d+)\s+"               
+        r"(\d{2}:\d{2}:\d{2})\s+" 
+        r"(.+?)\s+"               
+        r"([BS])\s+"              
+        r"(\d+)\s+"               
+        r"([\d.]+)\s+"            
+        r"([\d.]+)\s+"            
+        r"([\d.]+)\s+"            
+        r"([-]?\d+\.\d+)"         
+    ),
+    "dhan": re.compile(
+        r"(?P<order_no>\d{13,})\s+"
+        r"(?P<order_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<security>SELAN EXPLO\. TECH LT)\s*D?\s+"
+        r"(?P<side>BUY|SELL)\s+"
+        r"(?P<qty>\d+)\s*(?:D)?\s+"
+        r"(?P<price>\d+\.\d+)\s+"         
+        r"(?P<brokerage>\d+\.\d+)\s+"     
+        r"(?P<net_rate>\d+\.\d+)\s+"      
+        r"(?P<closing_rate>\d+\.\d+)\s+"  
+        r"(?P<stt>\d+\.\d+)\s+"           
+        r"(?P<net_total>-?\d+\.\d+)\s+"
+        r"(NSE-M|BSE)"
+    ),
+    "jm_financial": re.compile(
+        r"(\d+)\s+"
+        r"(\d{2}:\d{2}:\d{2})\s+"
+        r"(\d+)\s+"
+        r"(\d{2}:\d{2}:\d{2})\s+"
+        r"(.+?)\s+"
+        r"(BUY|SELL)\s+"
+        r"(\d+)\s+"
+        r"([\d,]+\.\d+)\s+"
+        r"([\d,]+\.\d+)\s+"
+        r"([\d,]+\.\d+)"
+    ),
+    "arihant": re.compile(
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<security>.+?)\s+"  
+        r"(?P<side>[BS])\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)\s+"
+        r"[\d.]+\s+"  
+        r"[\d.]+\s+"  
+        r"(?P<net_total>[-\d.]+)"
+    ),
+    "axis": re.compile(
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<security>.+?)\s+"
+        r"(?P<side>BUY|SELL)\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)\s+"
+        r"[\d.]+\s+"  
+        r"[\d.]+\s+"  
+        r"(?P<net_total>[\d,().-]+)"
+    ),
+    "bp_equities": re.compile(
+        r"(?P<order_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<security>.+?)\s+"
+        r"(?P<side>Buy|Sell)\s+[-]?(?=\d)"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)\s+"
+        r"(?P<brokerage>[\d.]+)\s+"
+        r"(?P<net_rate>[\d.]+)\s+"
+        r"(?P<closing_rate>[\d.]+)"
+    ),
+    "javeri": re.compile(
+        r"(?P<order_no>\d+)\s+"
+        r"(?P<order_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<security>.+?)\s+"
+        r"(?P<side>Buy|Sell)\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)"
+    ),
+    "greshma": re.compile(
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<security>.+?)\s+"
+        r"(?P<side>[BS])\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)\s+"
+        r"(?P<brokerage>[\d.]+)\s+"
+        r"(?P<net_rate>[\d.]+)\s+"
+        r"(?P<net_total>[-\d,.()]+)"
+    ),
+    "kotak": re.compile(
+        r"(GMDCLTD EQ|SUN RETAIL LIMITED)\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)\s+"
+        r"(?P<amount>[\d,.]+)"
+    ),
+    "rudra": re.compile(
+        r"NSE\s+(?P<price>\d+\.\d+)\s+(?P<amount>\d+\.\d+)D\s+(?P<qty>\d+)\s+(?P<total>\d+\.\d+)"
+    ),
+    "arihant_mer": re.compile(
+        r"(?P<price>\d+\.\d+)\s+0\.0000\s+(?P<net_rate>\d+\.\d+)\s+(?P<brokerage>\d+\.\d+)\s+(?P<gross_rate>\d+\.\d+)\s+(?P<qty>\d+)(?P<side>[BS])\s+OPTSTK\s+(?P<security>.+?)\s+(?P<trade_time>\d{2}:\d{2}:\d{2})\s+(?P<trade_no>\d+)\s+(?P<order_time>\d{2}:\d{2}:\d{2})\s+(?P<order_no>\d+)"
+    ),
+    "javeri_signed": re.compile(
+        r"(?P<order_no>\d+)\s+"
+        r"(?P<order_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<security>.+?)\s+"
+        r"(?P<side>Buy|Sell)\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)"
+    ),
+    "zerodha_old": re.compile(
+        r"(?P<order_no>\d+)\s+"
+        r"(?P<order_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<security>.+?)\s*/\s+INE\d+[A-Z0-9]*\s+"
+        r"(?P<side>[BS])\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)\s+"
+        r"(?P<net_total>\(?-?[\d.]+\)?)"
+    ),
+    "zerodha_2018_style": re.compile(
+        r"(?P<order_no>\d+)\s+"
+        r"(?P<order_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<trade_no>\d+)\s+"
+        r"(?P<trade_time>\d{2}:\d{2}:\d{2})\s+"
+        r"(?P<security>.+?)\s*/\s+INE\d+[A-Z0-9]*\s+"
+        r"(?P<side>[BS])\s+"
+        r"(?P<qty>\d+)\s+"
+        r"(?P<price>[\d.]+)\s+"
+        r"(?P<net_total>\(?-?[\d.]+\)?)"
+    ),
+}
+
+# not checked against real notes, so no layout uses it yet; opt a broker in with Layout(stop_marker=OBLIGATION_SUMMARY)
+# once its notes are confirmed to print the summary after the trades
+OBLIGATION_SUMMARY = re.compile(r"PAY\s*IN\s*/\s*PAY\s*OUT\s+OBLIGATION", re.IGNORECASE)
+
+LAYOUTS = {
+    "goldmine": Layout(),
+    "dhan": Layout(),
+    "jm_financial": Layout(),
+    "arihant": Layout(),
+    "axis": Layout(),
+    "bp_equities": Layout(),
+    "javeri": Layout(),
+    "greshma": Layout(),
+    "kotak": Layout(),
+    "rudra": Layout(),
+    "arihant_mer": Layout(),
+    "javeri_signed": Layout(),
+    "zerodha_old": Layout(),
+    "zerodha_2018_style": Layout(),
+}
+
+TABLES = {
+    "dhan": TableLayout(
+        ("ORDER NO", "ORDER TIME", "TRADE NO", "TRADE TIME", "SECURITY", "B/S", "QTY", "RATE",
+         "BROKERAGE", "NET RATE", "CLOSING RATE", "STT", "NET TOTAL", "EXCHANGE"),
+        ("order_no", None, "trade_no", "trade_time", "security", "side", "qty", "price",
+         None, None, None, None, "net_total", None)
+    ),
+    "kotak": TableLayout(
+        ("SECURITY", "QUANTITY", "RATE", "AMOUNT"),
+        ("security", "qty", "price", "net_total")
+    ),
+    "rudra": TableLayout(
+        ("SECURITY", "EXCHANGE", "RATE", "AMOUNT", "QTY", "TOTAL"),
+        ("security", None, "price", None, "qty", "net_total")
+    ),
+}
+
+
+def _amounts(doc, *cells):
+    try:
+        return [Decimal(cell) for cell in cells]
+    except InvalidOperation:
+        print(f"⚠️ Skipping row in {doc.name}: unparseable amount in {cells}")
+        return None
+
+
+def _table_decimal(cell):
+    cell = cell.replace(",", "")
+    if cell.startswith("(") and cell.endswith(")"):
+        cell = f"-{cell[1:-1]}"
+    return Decimal(cell)
+
+
+def process_goldmine_generic(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["goldmine"]
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["goldmine"]):
+            for match in pattern.finditer(text):
+                amounts = _amounts(doc, match.group(8), match.group(11))
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=match.group(4),
+                    trade_no=match.group(3),
+                    trade_date=trade_date,
+                    security=match.group(5).strip(),
+                    side=match.group(6),
+                    quantity=int(match.group(7)),
+                    price=price,
+                    net_total=net_total,
+                    order_no=match.group(1)
+                )
+
+
+def process_dhan(pdf_path, trade_date, pages=None):
+    trade_pattern = PATTERNS["dhan"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["dhan"]):
+            for match in trade_pattern.finditer(text):
+                gd = match.groupdict()
+                amounts = _amounts(doc, gd["price"], gd["net_total"])
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"],
+                    side="B" if gd["side"] == "BUY" else "S",
+                    quantity=int(gd["qty"]),
+                    price=price,
+                    net_total=net_total,
+                    order_no=gd["order_no"]
+                )
+
+
+def process_dhan_table(pdf_path, trade_date, pages=None):
+    with open_document(pdf_path) as doc:
+        for row in doc.table_rows(TABLES["dhan"], pages, layout=LAYOUTS["dhan"]):
+            qty = row["qty"].rstrip(" D")
+            if not qty.isdigit() or not row["trade_no"].isdigit() or row["side"] not in ("BUY", "SELL"):
+                continue
+            try:
+                price, net_total = _table_decimal(row["price"]), _table_decimal(row["net_total"])
+            except InvalidOperation:
+                continue
+            yield Trade(
+                source_pdf=doc.name,
+                trade_time=row["trade_time"],
+                trade_no=row["trade_no"],
+                trade_date=trade_date,
+                security=row["security"].removesuffix(" D"),
+                side="B" if row["side"] == "BUY" else "S",
+                quantity=int(qty),
+                price=price,
+                net_total=net_total,
+                order_no=row["order_no"]
+            )
+
+
+def process_jm_financial(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["jm_financial"]
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["jm_financial"]):
+            for match in pattern.finditer(text):
+                qty = int(match.group(7))
+                amounts = _amounts(doc, match.group(8).replace(",", ""))
+                if amounts is None:
+                    continue
+                price, = amounts
+                net_total = (qty * price).quantize(PAISE)
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=match.group(4),
+                    trade_no=match.group(3),
+                    trade_date=trade_date,
+                    security=match.group(5).strip(),
+                    side="B" if match.group(6) == "BUY" else "S",
+                    quantity=qty,
+                    price=price,
+                    net_total=net_total,
+                    order_no=match.group(1)
+                )
+def process_arihant(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["arihant"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["arihant"]):
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                amounts = _amounts(doc, gd["price"], gd["net_total"])
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side=gd["side"],
+                    quantity=int(gd["qty"]),
+                    price=price,
+                    net_total=net_total
+                )
+
+
+def process_axis(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["axis"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["axis"]):
+            if not text:
+                continue
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                net_total = gd["net_total"].replace(",", "").strip("()")
+                if gd["net_total"].startswith("("):
+                    net_total = f"-{net_total}"
+                amounts = _amounts(doc, gd["price"], net_total)
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side="B" if gd["side"] == "BUY" else "S",
+                    quantity=int(gd["qty"]),
+                    price=price,
+                    net_total=net_total
+                )
+
+
+
+def process_bp_equities(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["bp_equities"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["bp_equities"]):
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                qty = int(gd["qty"])
+                amounts = _amounts(doc, gd["price"])
+                if amounts is None:
+                    continue
+                price, = amounts
+                net_total = (qty * price).quantize(PAISE)
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side="B" if gd["side"].upper() == "BUY" else "S",
+                    quantity=qty,
+                    price=price,
+                    net_total=net_total
+                )
+
+
+def process_javeri(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["javeri"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["javeri"]):
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                qty = int(gd["qty"])
+                amounts = _amounts(doc, gd["price"])
+                if amounts is None:
+                    continue
+                price, = amounts
+                net_total = (qty * price).quantize(PAISE)
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side="B" if gd["side"].upper() == "BUY" else "S",
+                    quantity=qty,
+                    price=price,
+                    net_total=net_total,
+                    order_no=gd["order_no"]
+                )
+
+def process_greshma(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["greshma"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, prefilter=True, layout=LAYOUTS["greshma"]):
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                net_total = gd["net_total"].replace(",", "").strip("()")
+                if gd["net_total"].startswith("("):
+                    net_total = f"-{net_total}"
+                amounts = _amounts(doc, gd["price"], net_total)
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side=gd["side"],
+                    quantity=int(gd["qty"]),
+                    price=price,
+                    net_total=net_total
+                )
+
+
+def process_kotak(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["kotak"]
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, layout=LAYOUTS["kotak"]):
+            for match in pattern.finditer(text):
+                qty = int(match.group("qty"))
+                amounts = _amounts(doc, match.group("price"), match.group("amount").replace(",", ""))
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time="",
+                    trade_no="",
+                    trade_date=trade_date,
+                    security=match.group(1),
+                    side="S",
+                    quantity=qty,
+                    price=price,
+                    net_total=net_total
+                )
+
+
+def process_kotak_table(pdf_path, trade_date, pages=None):
+    with open_document(pdf_path) as doc:
+        for row in doc.table_rows(TABLES["kotak"], pages, layout=LAYOUTS["kotak"]):
+            if not row["qty"].isdigit() or not row["security"]:
+                continue
+            try:
+                price, net_total = _table_decimal(row["price"]), _table_decimal(row["net_total"])
+            except InvalidOperation:
+                continue
+            yield Trade(
+                source_pdf=doc.name,
+                trade_time="",
+                trade_no="",
+                trade_date=trade_date,
+                security=row["security"],
+                side="S",
+                quantity=int(row["qty"]),
+                price=price,
+                net_total=net_total
+            )
+
+
+def process_rudra(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["rudra"]
+    with open_document(pdf_path) as doc:
+        for text in doc.texts(pages, layout=LAYOUTS["rudra"]):
+            if not text:
+                continue
+            lines = text.splitlines()
+            for i, line in enumerate(lines):
+                if "NSE" in line and "D" in line:
+                    match = pattern.search(line)
+                    if match:
+                        qty = match.group("qty")
+                        price = match.group("price")
+                        total = match.group("total")
+                        security = lines[i - 1].strip() if i > 0 else "UNKNOWN"
+                        amounts = _amounts(doc, price, total)
+                        if amounts is None:
+                            continue
+                        yield Trade(
+                            source_pdf=doc.name,
+                            trade_time="",  
+                            trade_no="",    
+                            trade_date=trade_date,
+                            security=security,
+                            side="S",  
+                            quantity=int(qty),
+                            price=amounts[0],
+                            net_total=amounts[1]
+                        )
+
+
+def process_rudra_table(pdf_path, trade_date, pages=None):
+    with open_document(pdf_path) as doc:
+        for row in doc.table_rows(TABLES["rudra"], pages, layout=LAYOUTS["rudra"]):
+            if not row["qty"].isdigit() or not row["security"]:
+                continue
+            try:
+                price, net_total = _table_decimal(row["price"]), _table_decimal(row["net_total"])
+            except InvalidOperation:
+                continue
+            yield Trade(
+                source_pdf=doc.name,
+                trade_time="",
+                trade_no="",
+                trade_date=trade_date,
+                security=row["security"],
+                side="S",
+                quantity=int(row["qty"]),
+                price=price,
+                net_total=net_total
+            )
+
+
+def process_arihant_mer(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["arihant_mer"]
+    with open_document(pdf_path) as doc:
+        for text in doc.joined_texts(pages, prefilter=True, layout=LAYOUTS["arihant_mer"]):
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                amounts = _amounts(doc, gd["price"])
+                if amounts is None:
+                    continue
+                price, = amounts
+                net_total = price * int(gd["qty"])
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=f"OPTSTK {gd['security'].strip()}",
+                    side=gd["side"],
+                    quantity=int(gd["qty"]),
+                    price=price,
+                    net_total=net_total.quantize(PAISE),
+                    order_no=gd["order_no"]
+                )
+def process_javeri_signed(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["javeri_signed"]
+    with open_document(pdf_path) as doc:
+        for text in doc.joined_texts(pages, prefilter=True, layout=LAYOUTS["javeri_signed"]):
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                qty = int(gd["qty"])
+                amounts = _amounts(doc, gd["price"])
+                if amounts is None:
+                    continue
+                price, = amounts
+                net_total = (qty * price).quantize(PAISE)
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side="B" if gd["side"].lower() == "buy" else "S",
+                    quantity=qty,
+                    price=price,
+                    net_total=net_total,
+                    order_no=gd["order_no"]
+                )
+def process_zerodha_old(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["zerodha_old"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.joined_texts(pages, prefilter=True, layout=LAYOUTS["zerodha_old"]):
+            if not text:
+                continue
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                amounts = _amounts(doc, gd["price"], gd["net_total"].replace("(", "-").replace(")", ""))
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side=gd["side"],
+                    quantity=int(gd["qty"]),
+                    price=price,
+                    net_total=net_total,
+                    order_no=gd["order_no"]
+                )
+
+
+def process_zerodha_2018_style(pdf_path, trade_date, pages=None):
+    pattern = PATTERNS["zerodha_2018_style"]
+
+    with open_document(pdf_path) as doc:
+        for text in doc.joined_texts(pages, prefilter=True, layout=LAYOUTS["zerodha_2018_style"]):
+            if not text:
+                continue
+            for match in pattern.finditer(text):
+                gd = match.groupdict()
+                amounts = _amounts(doc, gd["price"], gd["net_total"].replace("(", "-").replace(")", ""))
+                if amounts is None:
+                    continue
+                price, net_total = amounts
+                yield Trade(
+                    source_pdf=doc.name,
+                    trade_time=gd["trade_time"],
+                    trade_no=gd["trade_no"],
+                    trade_date=trade_date,
+                    security=gd["security"].strip(),
+                    side=gd["side"],
+                    quantity=int(gd["qty"]),
+                    price=price,
+                    net_total=net_total,
+                    order_no=gd["order_no"]
+                )
+
+
+dispatch_map = {
+    "dhan_2.pdf": process_dhan,
+    "GOLDMINE_1.pdf": process_goldmine_generic,
+    "GOLDMINE_2.pdf": process_goldmine_generic,
+    "JM FINANCIAL.PDF": process_jm_financial,
+    "ARIHANT CAPITAL MARKETS LTD.pdf": process_arihant,
+    "AXIS.pdf": process_axis,
+    "BP Equities Pvt. Ltd..pdf": process_bp_equities,
+    "JAVERI FISCAL SERVICES LTD..pdf": process_javeri,
+    "Kotak_06-04-2021_Bill.pdf": process_kotak,
+    "greshma.pdf": process_greshma,
+    "rudra (1).pdf": process_rudra,
+    "CN_20231019_482600121_MER.pdf (1).pdf": process_arihant_mer,
+    "CNB_11_COMMON_CONTRACT_12Nov2023_S137__3951_signed (1).pdf": process_javeri_signed,
+    "Zerodha 27112018.pdf": process_zerodha_2018_style,
+    "zerodha_old.pdf": process_zerodha_old
+    
+  
+}
+
+Broker = namedtuple("Broker", "name parsers markers table_parsers", defaults=((),))
+
+BROKERS = [
+    Broker("dhan", (process_dhan,), ("DHAN", "MONEYLICIOUS SECURITIES"), (process_dhan_table,)),
+    Broker("goldmine", (process_goldmine_generic,), ("GOLDMINE",)),
+    Broker("jm_financial", (process_jm_financial,), ("JM FINANCIAL",)),
+    Broker("arihant", (process_arihant_mer, process_arihant), ("ARIHANT CAPITAL",)),
+    Broker("axis", (process_axis,), ("AXIS SECURITIES", "INZ000161633")),
+    Broker("bp_equities", (process_bp_equities,), ("BP EQUITIES",)),
+    Broker("javeri", (process_javeri_signed, process_javeri), ("JAVERI FISCAL",)),
+    Broker("greshma", (process_greshma,), ("GRESHMA",)),
+    Broker("kotak", (process_kotak,), ("KOTAK SECURITIES", "INZ000200137"), (process_kotak_table,)),
+    Broker("rudra", (process_rudra,), ("RUDRA",), (process_rudra_table,)),
+    Broker("zerodha", (process_zerodha_2018_style, process_zerodha_old), ("ZERODHA", "INZ000031633")),
+]
+
+
+PARSER_BROKERS = {
+    parser.__name__: broker.name for broker in BROKERS for parser in broker.parsers + broker.table_parsers
+}
+
+
+def detect_brokers(doc):
+    first_page = doc.text(0).upper() if len(doc) else ""
+    scores = [(sum(marker in first_page for marker in broker.markers), broker) for broker in BROKERS]
+    best = max(score for score, _ in scores)
+    if best == 0:
+        return list(BROKERS)
+    return [broker for score, broker in scores if score == best]
+
+
+def _run_parser(parser, doc, trade_date, pages=None):
+    doc.stopped_at = None
+    if not doc.metrics.enabled:
+        return list(parser(doc, trade_date, pages)), NULL_METRICS, doc.stopped_at
+    records, matches, scan = [], Counter(), Metrics()
+    doc.scanned_pages.clear()
+    doc.scan_metrics = scan
+    try:
+        for record in parser(doc, trade_date, pages):
+            matches[doc.current_page] += 1
+            records.append(record)
+    finally:
+        doc.scan_metrics = doc.metrics
+    for index in sorted(doc.scanned_pages | set(matches)):
+        scan.count("matches", matches[index], page=index)
+        if not matches[index]:
+            scan.count("zero_match_pages")
+    return records, scan, doc.stopped_at
+
+
+def _warn_stopped(doc, parser, records, stopped_at):
+    if stopped_at is not None and not records:
+        print(f" ⚠️ {parser.__name__} hit its stop marker on page {stopped_at + 1} of {doc.name} "
+              f"before any trade matched; check LAYOUTS")
+
+
+def parse_document(doc, trade_date, pages=None):
+    candidates = [
+        parser for broker in detect_brokers(doc)
+        for parser in (broker.table_parsers if TABLE_PARSING and broker.table_parsers else broker.parsers)
+    ]
+    if len(candidates) == 1:
+        records, scan, stopped_at = _run_parser(candidates[0], doc, trade_date, pages)
+        doc.metrics.merge(scan)
+        _warn_stopped(doc, candidates[0], records, stopped_at)
+        return candidates[0], records
+    best_parser, best_records, best_scan, best_stopped_at, first_error = None, [], None, None, None
+    for parser in candidates:
+        try:
+            records, scan, stopped_at = _run_parser(parser, doc, trade_date, pages)
+        except Exception as e:
+            first_error = first_error or e
+            continue
+        if best_parser is None or len(records) > len(best_records):
+            best_parser, best_records, best_scan, best_stopped_at = parser, records, scan, stopped_at
+    if best_parser is None:
+        raise first_error
+    doc.metrics.merge(best_scan)
+    _warn_stopped(doc, best_parser, best_records, best_stopped_at)
+    return best_parser, best_records
+
+
+def _page_count(pdf_path, cache=None):
+    with PageTexts(pdf_path, cache) as doc:
+        return len(doc)
+
+
+def plan_jobs(files, pages_per_job=PAGES_PER_JOB, cache=None):
+    jobs = []
+    for file_name, path, date in files:
+        try:
+            page_count = _page_count(path, cache) if pages_per_job else 0
+        except Exception:
+            page_count = 0
+        if page_count <= pages_per_job:
+            jobs.append((file_name, path, date, None))
+            continue
+        # ranges are planned before any stop_marker is seen, so jobs past the trade table still extract its pages
+        for start in range(0, page_count, pages_per_job):
+            jobs.append((file_name, path, date, range(start, min(start + pages_per_job, page_count))))
+    return jobs
+
+
+def run_job(job, cache=None, profile=False):
+    file_name, path, date, pages = job
+    metrics = Metrics() if profile else NULL_METRICS
+    try:
+        with PageTexts(path, cache, metrics) as doc:
+            date = date or detect_trade_date(doc)
+            handler = dispatch_map.get(file_name)
+            if handler is None:
+                handler, records = parse_document(doc, date, pages)
+            else:
+                records, scan, stopped_at = _run_parser(handler, doc, date, pages)
+                doc.metrics.merge(scan)
+                _warn_stopped(doc, handler, records, stopped_at)
+        return job, handler.__name__, records, None, metrics.to_dict()
+    except Exception as e:
+        return job, None, [], str(e), metrics.to_dict()
+
+
+def run_batch(files, workers=BATCH_WORKERS, pages_per_job=PAGES_PER_JOB, cache=None, profile=False):
+    jobs = plan_jobs(files, pages_per_job, cache)
+    worker = partial(run_job, cache=cache, profile=profile)
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(worker, jobs)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(worker, jobs)
+
+
+def _describe(file_name, pages):
+    if pages is None:
+        return file_name
+    return f"{file_name} (pages {pages.start + 1}-{pages.stop})"
+
+
+def parse_contract_note(source, trade_date=None, parser=None, cache=None, name=None):
+    with PageTexts(source, cache, name=name) as doc:
+        trade_date = trade_date or detect_trade_date(doc)
+        if parser is None:
+            return parse_document(doc, trade_date)[1]
+        return list(parser(doc, trade_date))
+
+
+def _parse_submission(source, trade_date, name, cache):
+    try:
+        return parse_contract_note(source, trade_date, cache=cache, name=name), None
+    except Exception as e:
+        return [], str(e)
+
+
+class JobRunner:
+    def __init__(self, workers=BATCH_WORKERS, max_pending=100, executor=None, cache=None):
+        import asyncio
+        self.workers = workers
+        self.cache = cache
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._results = asyncio.Queue()
+        self._tasks = []
+        self._next_id = 0
+        self._closed = False
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def start(self):
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def submit(self, source, trade_date=None, name=None):
+        if self._closed:
+            raise RuntimeError("JobRunner is closed")
+        if not isinstance(source, (str, bytes, os.PathLike)):
+            name = name or os.path.basename(getattr(source, "name", "") or "<stream>")
+            source = source.read()
+        if isinstance(source, os.PathLike):
+            source = os.fspath(source)
+        job_id = self._next_id
+        self._next_id += 1
+        await self._queue.put((job_id, source, trade_date, name))
+        return job_id
+
+    async def _work(self):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id, source, trade_date, name = await self._queue.get()
+            try:
+                name = name or (os.path.basename(source) if isinstance(source, str) else "<bytes>")
+                try:
+                    trades, error = await loop.run_in_executor(
+                        self._executor, _parse_submission, source, trade_date, name, self.cache
+                    )
+                except Exception as e:
+                    trades, error = [], str(e) or type(e).__name__
+                await self._results.put((job_id, name, trades, error))
+            finally:
+                self._queue.task_done()
+
+    async def results(self):
+        while True:
+            result = await self._results.get()
+            if result is None:
+                return
+            yield result
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        await self._queue.join()
+        import asyncio
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._results.put(None)
+        if self._owns_executor:
+            self._executor.shutdown()
+
+
+class NdjsonWriter:
+    def __init__(self, path, resume=True, finalize=True, append=False):
+        self.path = path
+        self.progress_path = f"{path}.progress"
+        self.finalize = finalize
+        self.completed = set()
+        self.count = 0
+        self.failed = False
+        self._pending = 0
+        offset = self._load_progress() if resume else None
+        if not resume and os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+        baseline = offset is None and append and os.path.exists(path)
+        if offset is None:
+            # only an offset the sidecar recorded is trusted for truncation; appending keeps what is already there
+            offset = os.path.getsize(path) if baseline else 0
+        self._file = open(path, "ab")
+        self._file.truncate(offset)
+        self._committed = offset
+        self._progress = open(self.progress_path, "a")
+        if baseline:
+            self._progress.write(json.dumps({"offset": offset}) + "\n")
+            self._progress.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(finished=exc_type is None)
+
+    def _load_progress(self):
+        offset = None
+        if not os.path.exists(self.progress_path):
+            return offset
+        with open(self.progress_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if "path" in entry:
+                    self.completed.add(entry["path"])
+                offset = entry["offset"]
+        return offset
+
+    def write(self, records, broker=None):
+        for record in records:
+            self._file.write(json.dumps(record.to_dict()).encode() + b"\n")
+            self.count += 1
+            self._pending += 1
+
+    def commit(self, key):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._committed = self._file.tell()
+        self._progress.write(json.dumps({"path": key, "offset": self._committed}) + "\n")
+        self._progress.flush()
+        os.fsync(self._progress.fileno())
+        self.completed.add(key)
+        self._pending = 0
+
+    def rollback(self):
+        self._file.flush()
+        self._file.truncate(self._committed)
+        self.count -= self._pending
+        self._pending = 0
+        self.failed = True
+
+    def close(self, finished=False):
+        self._file.close()
+        self._progress.close()
+        # the sidecar only exists to resume a crashed or partly failed run; a clean finish starts the next run fresh
+        if finished and self.finalize and not self.failed:
+            os.remove(self.progress_path)
+
+
+TRADE_COLUMNS = ("source_pdf", "trade_time", "trade_no", "trade_date", "security", "side", "quantity", "price", "net_total")
+
+
+def _iso_date(trade_date):
+    try:
+        return datetime.strptime(trade_date, "%d/%m/%Y").date()
+    except ValueError:
+        return None
+
+
+class PartitionedSink:
+    extension = None
+
+    def __init__(self, directory, batch_size=SINK_BATCH_SIZE, resume=True):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.progress_path = os.path.join(directory, "_progress.ndjson")
+        self.completed = set()
+        self.count = 0
+        self.failed = False
+        self._run_id = f"{int(time.time())}-{os.getpid()}"
+        self._parts = 0
+        self._pending = {}
+        self._buffered = {}
+        self._buffered_rows = 0
+        self._buffered_keys = []
+        kept = self._load_progress() if resume else set()
+        if not resume and os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+        # parts the sidecar does not list come from a finished run, a fresh run or a flush cut short, so replace them
+        for path in glob.glob(os.path.join(directory, "date=*", "broker=*", f"part-*.{self.extension}")):
+            if os.path.relpath(path, directory) not in kept:
+                os.remove(path)
+        os.makedirs(directory, exist_ok=True)
+        self._progress = open(self.progress_path, "a")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(finished=exc_type is None)
+
+    def _load_progress(self):
+        kept = set()
+        if not os.path.exists(self.progress_path):
+            return kept
+        with open(self.progress_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.completed.update(entry["paths"])
+                kept.update(entry["parts"])
+        return kept
+
+    def write(self, records, broker=None):
+        for trade in records:
+            trade_date = _iso_date(trade.trade_date)
+            partition = (trade_date.isoformat() if trade_date else "unknown", broker or "unknown")
+            self._pending.setdefault(partition, []).append(trade)
+            self.count += 1
+
+    def commit(self, key):
+        for partition, trades in self._pending.items():
+            self._buffered.setdefault(partition, []).extend(trades)
+            self._buffered_rows += len(trades)
+        self._pending = {}
+        self._buffered_keys.append(key)
+        self.completed.add(key)
+        if self._buffered_rows >= self.batch_size:
+            self.flush()
+
+    def rollback(self):
+        self.count -= sum(len(trades) for trades in self._pending.values())
+        self._pending = {}
+        self.failed = True
+
+    def flush(self):
+        if not self._buffered_keys:
+            return
+        parts = []
+        for (trade_date, broker), trades in self._buffered.items():
+            directory = os.path.join(self.directory, f"date={trade_date}", f"broker={broker}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{self._run_id}-{self._parts:05d}.{self.extension}")
+            self._write_part(path, trades)
+            parts.append(os.path.relpath(path, self.directory))
+            self._parts += 1
+        # files count as done only once their parts are on disk
+        self._progress.write(json.dumps({"paths": self._buffered_keys, "parts": parts}) + "\n")
+        self._progress.flush()
+        os.fsync(self._progress.fileno())
+        self._buffered = {}
+        self._buffered_rows = 0
+        self._buffered_keys = []
+
+    def close(self, finished=False):
+        self.flush()
+        self._progress.close()
+        if finished and not self.failed:
+            os.remove(self.progress_path)
+
+    def _write_part(self, path, trades):
+        raise NotImplementedError
+
+
+class CsvSink(PartitionedSink):
+    extension = "csv"
+
+    def _write_part(self, path, trades):
+        import csv
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(TRADE_COLUMNS)
+            for trade in trades:
+                trade_date = _iso_date(trade.trade_date)
+                writer.writerow((
+                    trade.source_pdf, trade.trade_time, trade.trade_no, trade_date.isoformat() if trade_date else "",
+                    trade.security, trade.side, trade.quantity, trade.price, trade.net_total
+                ))
+
+
+class ArrowSink(PartitionedSink):
+    extension = "arrow"
+
+    def __init__(self, directory, batch_size=SINK_BATCH_SIZE, resume=True):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("pyarrow is required for Parquet and Arrow output: pip install pyarrow") from None
+        super().__init__(directory, batch_size, resume)
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([
+            ("source_pdf", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+            ("trade_time", pyarrow.string()),
+            ("trade_no", pyarrow.string()),
+            ("trade_date", pyarrow.date32()),
+            ("security", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+            ("side", pyarrow.dictionary(pyarrow.int8(), pyarrow.string())),
+            ("quantity", pyarrow.int64()),
+            ("price", pyarrow.decimal128(18, 4)),
+            ("net_total", pyarrow.decimal128(18, 4)),
+        ])
+
+    def _table(self, trades):
+        columns = {name: [getattr(trade, name) for trade in trades] for name in TRADE_COLUMNS}
+        columns["trade_date"] = [_iso_date(value) for value in columns["trade_date"]]
+        return self.pa.Table.from_pydict(columns, schema=self.schema)
+
+    def _write_part(self, path, trades):
+        table = self._table(trades)
+        with self.pa.OSFile(path, "wb") as sink:
+            with self.pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+class ParquetSink(ArrowSink):
+    extension = "parquet"
+
+    def _write_part(self, path, trades):
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(self._table(trades), path)
+
+
+def trade_key(trade, broker=None, ordinals=None):
+    broker = broker or "unknown"
+    if trade.trade_no:
+        return "|".join((broker, trade.trade_date, trade.trade_no, trade.order_no))
+    content = "|".join((
+        broker, trade.trade_date, trade.security, trade.side,
+        str(trade.quantity), str(trade.price), str(trade.net_total)
+    ))
+    ordinal = 0
+    if ordinals is not None:
+        ordinal = ordinals[content]
+        ordinals[content] += 1
+    return hashlib.sha256(f"{content}#{ordinal}".encode()).hexdigest()
+
+
+class TradeIndex:
+    UPSERT = (
+        "ON CONFLICT(key) DO UPDATE SET broker = excluded.broker, trade_date = excluded.trade_date, "
+        "source_pdf = excluded.source_pdf, seq = excluded.seq, ingested = excluded.ingested, record = excluded.record"
+    )
+    COLUMNS = (("seq", "INTEGER DEFAULT 0"), ("ingested", "REAL DEFAULT 0"))
+
+    def __init__(self, path=INDEX_PATH):
+        import sqlite3
+        self.path = path
+        self.count = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS trades (
+                key TEXT PRIMARY KEY,
+                broker TEXT,
+                trade_date TEXT,
+                source_pdf TEXT,
+                seq INTEGER,
+                ingested REAL,
+                record TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY);
+        """)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(trades)")}
+        for column, kind in self.COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE trades ADD COLUMN {column} {kind}")
+        self._conn.commit()
+        self.completed = {path for path, in self._conn.execute("SELECT path FROM files")}
+        self._ordinals = Counter()
+        self._pending = 0
+        self._seq = 0
+        self._ingested = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, records, broker=None):
+        if self._ingested is None:
+            self._ingested = time.time()
+        rows = []
+        for trade in records:
+            trade_date = _iso_date(trade.trade_date)
+            rows.append((
+                trade_key(trade, broker, self._ordinals), broker, trade_date.isoformat() if trade_date else "",
+                trade.source_pdf, self._seq, self._ingested, json.dumps(trade.to_dict())
+            ))
+            self._seq += 1
+        self._conn.executemany(
+            "INSERT INTO trades (key, broker, trade_date, source_pdf, seq, ingested, record) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) " + self.UPSERT,
+            rows
+        )
+        self._pending += len(rows)
+        self.count += len(rows)
+
+    def commit(self, key):
+        self._conn.execute("INSERT OR IGNORE INTO files (path) VALUES (?)", (key,))
+        self._conn.commit()
+        self.completed.add(key)
+        self._ordinals.clear()
+        self._pending = 0
+        self._seq = 0
+        self._ingested = None
+
+    def rollback(self):
+        self._conn.rollback()
+        self._ordinals.clear()
+        self.count -= self._pending
+        self._pending = 0
+        self._seq = 0
+        self._ingested = None
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+
+    def merge(self, path):
+        TradeIndex(path).close()  # brings an older shard's schema up to date
+        self._conn.commit()
+        self._conn.execute("ATTACH DATABASE ? AS other", (path,))
+        try:
+            cursor = self._conn.execute(
+                "INSERT INTO trades (key, broker, trade_date, source_pdf, seq, ingested, record) "
+                "SELECT key, broker, trade_date, source_pdf, seq, ingested, record FROM other.trades WHERE true "
+                + self.UPSERT + " WHERE (excluded.ingested, excluded.source_pdf) >= (trades.ingested, trades.source_pdf)"
+            )
+            self._conn.execute("INSERT OR IGNORE INTO files (path) SELECT path FROM other.files")
+            self._conn.commit()
+            self.count += cursor.rowcount
+            self.completed.update(path for path, in self._conn.execute("SELECT path FROM other.files"))
+        finally:
+            self._conn.execute("DETACH DATABASE other")
+
+    def records(self):
+        query = "SELECT record FROM trades ORDER BY trade_date, source_pdf, seq"
+        for record, in self._conn.execute(query):
+            yield json.loads(record)
+
+    def export(self, path):
+        with open(path, "w") as f:
+            for record in self.records():
+                f.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+SINKS = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvSink,
+    "arrow": ArrowSink,
+    "parquet": ParquetSink,
+    "index": TradeIndex,
+}
+
+
+def _finish_file(writer, path, trades, failed, on_commit=None, anomalies=()):
+    if path is None:
+        return
+    if failed:
+        writer.rollback()
+        return
+    writer.commit(path)
+    if on_commit is not None:
+        on_commit(path)
+    if anomalies:
+        checks = Counter(anomaly["check"] for anomaly in anomalies)
+        print(f"\n ⚠️ {len(anomalies)} anomalies in {os.path.basename(path)}: "
+              + ", ".join(f"{check} x{count}" for check, count in checks.items()))
+    if trades:
+        print(f"\n Trades from: {os.path.basename(path)}")
+        print(json.dumps([trade.to_dict() for trade in trades], indent=4))
+
+
+class RunReport:
+    def __init__(self):
+        self.files = {}
+
+    def _file(self, path):
+        return self.files.setdefault(path, {"parser": None, "stages": {}, "counters": {}, "pages": {}, "anomalies": []})
+
+    def add_job(self, path, parser_name, metrics):
+        entry = self._file(path)
+        entry["parser"] = entry["parser"] or parser_name
+        for section in ("stages", "counters"):
+            for name, value in metrics[section].items():
+                entry[section][name] = entry[section].get(name, 0) + value
+        for index, page_stats in metrics["pages"].items():
+            stats = entry["pages"].setdefault(str(index), {})
+            for name, value in page_stats.items():
+                stats[name] = stats.get(name, 0) + value
+
+    def add(self, path, stage, seconds):
+        stages = self._file(path)["stages"]
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def add_anomalies(self, path, anomalies):
+        entry = self._file(path)
+        entry["anomalies"].extend(anomalies)
+        entry["counters"]["anomalies"] = entry["counters"].get("anomalies", 0) + len(anomalies)
+
+    def totals(self):
+        totals = {"files": len(self.files), "stages": {}, "counters": {}}
+        for entry in self.files.values():
+            for section in ("stages", "counters"):
+                for name, value in entry[section].items():
+                    totals[section][name] = totals[section].get(name, 0) + value
+        return totals
+
+    def write(self, path=REPORT_PATH):
+        with open(path, "w") as f:
+            json.dump({"files": self.files, "totals": self.totals()}, f, indent=4)
+
+    def print_summary(self):
+        stages = ("open", "extract", "match", "write", "validate")
+        print(f"\n{'file':<40}{'pages':>7}{'trades':>8}{'empty':>7}{'flagged':>9}" + "".join(f"{stage + ' s':>11}" for stage in stages))
+        rows = list(self.files.items()) + [("TOTAL", self.totals())]
+        for path, entry in rows:
+            counters = entry["counters"]
+            print(f"{os.path.basename(path)[:39]:<40}{counters.get('pages_scanned', 0):>7}"
+                  f"{counters.get('matches', 0):>8}{counters.get('zero_match_pages', 0):>7}{counters.get('anomalies', 0):>9}"
+                  + "".join(f"{entry['stages'].get(stage, 0.0):>11.3f}" for stage in stages))
+
+
+def process_files(files, writer, cache=None, workers=BATCH_WORKERS, on_commit=None, report=None, quiet=False,
+                  validate=VALIDATE):
+    current_path, file_trades, file_failed, file_anomalies = None, [], False, []
+    failed = []
+    results = run_batch(files, workers=workers, cache=cache, profile=report is not None)
+    for job, parser_name, records, error, metrics in results:
+        file_name, path, date, pages = job
+        if report is not None:
+            report.add_job(path, parser_name, metrics)
+        if path != current_path:
+            _finish_file(writer, current_path, file_trades, file_failed, on_commit, file_anomalies)
+            current_path, file_trades, file_failed, file_anomalies = path, [], False, []
+        if not quiet:
+            print(f"\n Processing: {_describe(file_name, pages)}")
+        if error is not None:
+            print(f" Failed to process {_describe(file_name, pages)}: {error}")
+            if not file_failed:
+                failed.append(path)
+            file_failed = True
+            continue
+        if not quiet:
+            print(f" Using parser: {parser_name}")
+        if report is None:
+            writer.write(records, PARSER_BROKERS.get(parser_name))
+        else:
+            started = time.perf_counter()
+            writer.write(records, PARSER_BROKERS.get(parser_name))
+            report.add(path, "write", time.perf_counter() - started)
+        if validate:
+            started = time.perf_counter()
+            anomalies = validate_trades(records, parser_name)
+            file_anomalies.extend(anomalies)
+            if report is not None:
+                report.add(path, "validate", time.perf_counter() - started)
+                report.add_anomalies(path, anomalies)
+        if PRINT_TRADES and not quiet:
+            file_trades.extend(records)
+        if not quiet:
+            print(f" Finished parsing {_describe(file_name, pages)}")
+    _finish_file(writer, current_path, file_trades, file_failed, on_commit, file_anomalies)
+    return failed
+
+
+class IngestManifest:
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        self._pending = {}
+        self._last_seen = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def pending(self, directory):
+        files, touched, seen = [], False, {}
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if not entry.is_file() or not entry.name.lower().endswith(".pdf"):
+                continue
+            stat = entry.stat()
+            known = self.entries.get(entry.path)
+            if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+                continue
+            # a file still being copied in changes between polls; wait until it holds still for one interval
+            seen[entry.path] = (stat.st_size, stat.st_mtime)
+            if self._last_seen.get(entry.path) != seen[entry.path]:
+                continue
+            digest = file_digest(entry.path)
+            if known and known["sha256"] == digest:
+                known["mtime"] = stat.st_mtime
+                touched = True
+                continue
+            self._pending[entry.path] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+            files.append((entry.name, entry.path, pdf_infos.get(entry.name)))
+        self._last_seen = seen
+        if touched:
+            self.save()
+        return files
+
+    def mark(self, path):
+        self.entries[path] = self._pending.pop(path)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+
+def watch(directory, output_path=OUTPUT_PATH, manifest_path=MANIFEST_PATH, interval=WATCH_INTERVAL, cache=None,
+          workers=BATCH_WORKERS, quiet=False, validate=VALIDATE):
+    manifest = IngestManifest(manifest_path)
+    with NdjsonWriter(output_path, finalize=False, append=True) as writer:
+        while True:
+            files = manifest.pending(directory)
+            if files:
+                try:
+                    process_files(files, writer, cache, workers=workers, on_commit=manifest.mark, quiet=quiet,
+                                  validate=validate)
+                finally:
+                    manifest.save()
+                print(f"\n Ingested {len(files)} file(s), {writer.count} trades so far")
+            time.sleep(interval)
+
+
+def shard_of(path, shards, shard_by="path"):
+    if shard_by == "content":
+        digest = file_digest(path)
+    else:
+        digest = hashlib.sha256(os.path.normpath(path).replace(os.sep, "/").encode()).hexdigest()
+    return int(digest[:16], 16) % shards
+
+
+def _shard_name(shard, shards):
+    return f"shard-{shard:03d}-of-{shards:03d}"
+
+
+def run_shard(files, shard, shards, directory=SHARD_DIR, shard_by="path", cache=None, workers=BATCH_WORKERS,
+              report=None, quiet=False, fresh=False, validate=VALIDATE):
+    os.makedirs(directory, exist_ok=True)
+    name = _shard_name(shard, shards)
+    files = [entry for entry in files if shard_of(entry[1], shards, shard_by) == shard]
+    with TradeIndex(os.path.join(directory, f"{name}.sqlite")) as index:
+        pending = files if fresh else [entry for entry in files if entry[1] not in index.completed]
+        failed = process_files(pending, index, cache, workers=workers, report=report, quiet=quiet,
+                               validate=validate)
+        trades = len(index)
+    manifest = {
+        "shard": shard,
+        "shards": shards,
+        "shard_by": shard_by,
+        "index": f"{name}.sqlite",
+        "files": [path for _, path, _ in files],
+        "failed": failed,
+        "trades": trades,
+        "finished": datetime.now().isoformat(timespec="seconds"),
+    }
+    path = os.path.join(directory, f"{name}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def find_shard_manifests(inputs):
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, "shard-*-of-*.json"))))
+        else:
+            paths.extend(sorted(glob.glob(pattern)))
+    return paths
+
+
+def merge_shards(manifest_paths, output_path=OUTPUT_PATH, output_format="ndjson"):
+    manifests = []
+    for path in manifest_paths:
+        with open(path) as f:
+            manifest = json.load(f)
+        manifest["index"] = os.path.join(os.path.dirname(path), manifest["index"])
+        manifests.append(manifest)
+    counts = {manifest["shards"] for manifest in manifests}
+    if len(counts) != 1:
+        raise ValueError(f"shard manifests come from runs with different shard counts: {sorted(counts)}")
+    missing = sorted(set(range(counts.pop())) - {manifest["shard"] for manifest in manifests})
+    failed = [path for manifest in manifests for path in manifest["failed"]]
+
+    index_path = output_path if output_format == "index" else f"{output_path}.merge.sqlite"
+    if output_format != "index" and os.path.exists(index_path):
+        os.remove(index_path)
+    with TradeIndex(index_path) as index:
+        for manifest in sorted(manifests, key=lambda manifest: manifest["shard"]):
+            index.merge(manifest["index"])
+        if output_format == "ndjson":
+            index.export(output_path)
+        trades = len(index)
+    if output_format != "index":
+        os.remove(index_path)
+    return trades, missing, failed
+
+
+def find_pdfs(inputs):
+    files, seen = [], set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in sorted(os.listdir(pattern)) if name.lower().endswith(".pdf")]
+        else:
+            paths = [
+                path for path in sorted(glob.glob(pattern, recursive=True))
+                if os.path.isfile(path) and path.lower().endswith(".pdf")
+            ]
+        if not paths:
+            print(f" No PDF files match: {pattern}")
+        for path in paths:
+            if path not in seen:
+                seen.add(path)
+                files.append((os.path.basename(path), path, pdf_infos.get(os.path.basename(path))))
+    return files
+
+
+def _shard_spec(value):
+    try:
+        shard, shards = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected K/N, for example 0/4") from None
+    if not 0 <= shard < shards:
+        raise argparse.ArgumentTypeError("K must be between 0 and N - 1")
+    return shard, shards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract trades from broker contract note PDFs")
+    parser.add_argument("inputs", nargs="*",
+                        help=f"PDF files, directories or glob patterns such as 'notes/**/*.pdf' (default: {PDF_DIR}); "
+                             f"shard manifests or directories with --merge (default: {SHARD_DIR})")
+    parser.add_argument("-j", "--jobs", type=int, default=BATCH_WORKERS, help="worker processes (default: %(default)s)")
+    parser.add_argument("-f", "--format", choices=sorted(SINKS), help=f"default: {OUTPUT_FORMAT}")
+    parser.add_argument("-o", "--output",
+                        help=f"output file or directory (default: {OUTPUT_PATH}, {INDEX_PATH} for index, {SHARD_DIR} with --shard)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print failures, anomalies and the total")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the extraction cache")
+    parser.add_argument("--fresh", action="store_true",
+                        help="reprocess every input instead of resuming an interrupted or partly failed run")
+    parser.add_argument("--no-validate", action="store_true", help="skip the per-batch sanity checks on parsed trades")
+    parser.add_argument("--profile", action="store_true", default=PROFILE, help=f"write per-stage timings to {REPORT_PATH}")
+    parser.add_argument("--watch", action="store_true", help="keep polling a single input directory for new notes")
+    parser.add_argument("--interval", type=int, default=WATCH_INTERVAL, help="seconds between --watch polls")
+    parser.add_argument("--shard", type=_shard_spec, metavar="K/N",
+                        help="parse only shard K of N of the inputs into an index and manifest under the output directory")
+    parser.add_argument("--shard-by", choices=("path", "content"), default="path",
+                        help="hash each input's path or its bytes to pick its shard (default: %(default)s)")
+    parser.add_argument("--merge", action="store_true", help="combine shard outputs into one de-duplicated trade set")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if sum((args.watch, args.shard is not None, args.merge)) > 1:
+        parser.error("--watch, --shard and --merge cannot be combined")
+
+    output_format = args.format or OUTPUT_FORMAT
+    output = args.output or (INDEX_PATH if output_format == "index" else OUTPUT_PATH)
+    if args.merge:
+        if output_format not in ("ndjson", "index"):
+            parser.error("--merge writes ndjson or index")
+        manifests = find_shard_manifests(args.inputs or [SHARD_DIR])
+        if not manifests:
+            parser.error("no shard manifests found")
+        trades, missing, failed = merge_shards(manifests, output, output_format)
+        print(f"\n Merged {len(manifests)} shard(s) into {output}: {trades} trades")
+        if missing:
+            print(f" Missing shards: {', '.join(map(str, missing))}")
+        if failed:
+            print(f" {len(failed)} file(s) failed in their shard: " + ", ".join(os.path.basename(path) for path in failed))
+        return 1 if missing or failed else 0
+
+    validate = VALIDATE and not args.no_validate
+    if validate and importlib.util.find_spec("numpy") is None:
+        print(" ⚠️ NumPy is not installed, skipping trade validation")
+        validate = False
+    cache = ExtractionCache() if USE_EXTRACTION_CACHE and not args.no_cache else None
+    inputs = args.inputs or [PDF_DIR]
+    if args.watch:
+        if len(inputs) != 1 or not os.path.isdir(inputs[0]):
+            parser.error("--watch takes a single directory")
+        if output_format != "ndjson":
+            parser.error("--watch only writes ndjson")
+        watch(inputs[0], output, interval=args.interval, cache=cache, workers=args.jobs, quiet=args.quiet,
+              validate=validate)
+
+    files = find_pdfs(inputs)
+    if not files:
+        parser.error("no PDF files found")
+
+    report = RunReport() if args.profile else None
+    if args.shard is not None:
+        if output_format != "index" and args.format is not None:
+            parser.error("--shard writes index shards")
+        shard, shards = args.shard
+        manifest = run_shard(files, shard, shards, args.output or SHARD_DIR, args.shard_by, cache,
+                             workers=args.jobs, report=report, quiet=args.quiet, fresh=args.fresh,
+                             validate=validate)
+        print(f"\n Shard {shard}/{shards}: {len(manifest['files'])} file(s), {manifest['trades']} trades")
+        if report is not None:
+            report.write()
+            report.print_summary()
+        if manifest["failed"]:
+            print(f" {len(manifest['failed'])} file(s) failed: "
+                  + ", ".join(os.path.basename(path) for path in manifest["failed"]))
+            return 1
+        return 0
+
+    sink = SINKS[output_format] if output_format == "index" else partial(SINKS[output_format], resume=not args.fresh)
+    with sink(output) as writer:
+        if not args.fresh:
+            files = [entry for entry in files if entry[1] not in writer.completed]
+        failed = process_files(files, writer, cache, workers=args.jobs, report=report, quiet=args.quiet,
+                               validate=validate)
+
+    print(f"\n Total Trades Extracted: {writer.count}")
+    if report is not None:
+        report.write()
+        report.print_summary()
+    if failed:
+        print(f" {len(failed)} of {len(files)} file(s) failed: " + ", ".join(os.path.basename(path) for path in failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())